@@ -1,126 +1,120 @@
 '''
 Hangman game with score tracking, rounds, and persistent player storage
-in JSON.
+in JSON Lines.
 '''
 
+import atexit
 import json
 import os
+import queue
 import random
+import sys
+import threading
+from dataclasses import dataclass
 
-# JSON file for storing player data
-FILENAME = 'player.json'
+# Use the faster orjson encoder when it is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# JSON Lines file for storing player data
+FILENAME = 'player.jsonl'
+# Plain JSON file used by earlier versions, imported once if found
+LEGACY_FILENAME = 'player.json'
 
 # ANSI color codes for terminal output
 BROWN = '\033[33m'
 GREEN = '\033[32m'
 RESET = '\033[0m'
 
-
-class Player:
+# Colored labels for the guess lists
+_CORRECT_PREFIX = f'{GREEN}Correct Guesses: '
+_WRONG_PREFIX = f'{BROWN}Wrong Guesses: '
+_SUFFIX = f'{RESET}\n'
+
+# Random generator shared by all games that are not seeded
+_RNG = random.Random()
+
+# Letters accepted as a guess
+_VALID_LETTERS = frozenset('abcdefghijklmnopqrstuvwxyz')
+
+# Words the game picks from
+_WORDS = (
+    'apple', 'banana', 'orange', 'grape', 'pear', 'peach', 'cherry',
+    'lemon', 'lime', 'mango', 'book', 'pen', 'paper', 'notebook', 'pencil',
+    'eraser', 'ruler', 'desk', 'chair', 'lamp', 'dog', 'cat', 'bird', 'fish',
+    'horse', 'cow', 'sheep', 'goat', 'pig', 'rabbit', 'run', 'jump', 'swim',
+    'fly', 'write', 'read', 'draw', 'sing', 'dance', 'play','happy', 'sad',
+    'angry', 'tired', 'excited', 'scared', 'brave', 'funny', 'kind', 'smart',
+    'house', 'school', 'office', 'shop', 'park', 'garden', 'street', 'city',
+    'village', 'country', 'car', 'bike', 'bus', 'train', 'plane', 'boat',
+    'truck', 'scooter', 'taxi', 'subway', 'red', 'blue', 'green', 'yellow',
+    'orange', 'purple', 'black', 'white', 'pink', 'brown', 'day', 'night',
+    'morning', 'evening', 'week', 'month', 'year', 'hour', 'minute', 'second',
+    'food', 'water', 'milk', 'bread', 'cheese', 'meat', 'rice', 'soup',
+    'fruit', 'vegetable', 'light', 'dark', 'hot', 'cold', 'warm', 'cool',
+    'strong', 'weak', 'big', 'small'
+)
+
+
+def _build_word_trie(words):
     '''
-    Represents a player with name, score, and number of rounds played.
-    Player data is saved persistently in a JSON file.
+    Build a trie of the given words, grouped by word length.
+    Each node maps a letter to its child node; the key `None` marks the
+    end of a word.
     '''
 
-    def __init__(self, player_name='', score=0, rounds=0):
-        self.player_name = player_name
-        self.score = score
-        self.rounds = rounds
-
-    @classmethod
-    def load_players(cls):
-        '''Load all players from the JSON file, if it exists.'''
-        if os.path.exists(FILENAME):
-            with open(FILENAME) as f:
-                return json.load(f)
-        else:
-            return {}
-
-    @classmethod
-    def create_player(cls, name):
-        '''Create a new player entry and save it to the JSON file.'''
-        p = cls(name)
-        players = cls.load_players()
-        players[name] = {'Score': p.score, 'Rounds': p.rounds}
+    tries = {}
+    for word in words:
+        node = tries.setdefault(len(word), {})
+        for letter in word:
+            node = node.setdefault(letter, {})
+        node[None] = True
+    return tries
 
-        with open(FILENAME, 'w') as f:
-            json.dump(players, f, indent=4)
-        return p
 
-    @classmethod
-    def player_exists(cls, name):
-        '''Check whether a player name already exists in the database.'''
-        players = cls.load_players()
-        return name in players
-
-    @classmethod
-    def clear_player(cls):
-        '''Erase all player data (used when clearing the highscore list).'''
-        with open(FILENAME, 'w') as f:
-            json.dump({}, f)
-
-    def update_player(self):
-        '''Update this player's score and round count in the JSON file.'''
-        players = Player.load_players()
-        players[self.player_name] = {
-            'Score': self.score,
-            'Rounds': self.rounds
-        }
-        with open(FILENAME, 'w') as f:
-            json.dump(players, f, indent=4)
-
-
-class Game:
+def matching_words(pattern, excluded=()):
     '''
-    Core Hangman game logic.
-    Stores a reference to the Player object so score and rounds can be updated.
+    Return all words fitting `pattern`, a string of letters with '_' for
+    unknown positions (e.g. '_a__'). Unknown positions never match a
+    letter from `excluded` or one already revealed.
     '''
 
-    def __init__(self, player):
-        self.player = player
+    global _word_trie
+    if _word_trie is None:
+        _word_trie = _build_word_trie(_WORDS)
 
-    def get_random_word(self):
-        '''Return a random word from a predefined list.'''
-        words = [
-            'apple', 'banana', 'orange', 'grape', 'pear', 'peach', 'cherry', 
-            'lemon', 'lime', 'mango', 'book', 'pen', 'paper', 'notebook', 'pencil', 
-            'eraser', 'ruler', 'desk', 'chair', 'lamp', 'dog', 'cat', 'bird', 'fish', 
-            'horse', 'cow', 'sheep', 'goat', 'pig', 'rabbit', 'run', 'jump', 'swim', 
-            'fly', 'write', 'read', 'draw', 'sing', 'dance', 'play','happy', 'sad', 
-            'angry', 'tired', 'excited', 'scared', 'brave', 'funny', 'kind', 'smart',
-            'house', 'school', 'office', 'shop', 'park', 'garden', 'street', 'city', 
-            'village', 'country', 'car', 'bike', 'bus', 'train', 'plane', 'boat', 
-            'truck', 'scooter', 'taxi', 'subway', 'red', 'blue', 'green', 'yellow', 
-            'orange', 'purple', 'black', 'white', 'pink', 'brown', 'day', 'night', 
-            'morning', 'evening', 'week', 'month', 'year', 'hour', 'minute', 'second',
-            'food', 'water', 'milk', 'bread', 'cheese', 'meat', 'rice', 'soup', 
-            'fruit', 'vegetable', 'light', 'dark', 'hot', 'cold', 'warm', 'cool', 
-            'strong', 'weak', 'big', 'small'
-        ]
-
-        return random.choice(words)
+    excluded = set(excluded) | (set(pattern) - {'_'})
+    matches = []
+    stack = [(_word_trie.get(len(pattern), {}), '')]
 
-    def display_items(self, items, kind='correct'):
-        '''
-        Display either correct or wrong guessed items using different colors.
-        `kind` can be 'correct' or 'wrong'.
-        '''
+    while stack:
+        node, prefix = stack.pop()
+        if len(prefix) == len(pattern):
+            if None in node:
+                matches.append(prefix)
+            continue
 
-        if kind == 'correct':
-            print(GREEN + 'Correct Guesses: ' + ' '.join(items) + RESET + '\n')
+        known = pattern[len(prefix)]
+        if known != '_':
+            if known in node:
+                stack.append((node[known], prefix + known))
+        else:
+            for letter, child in node.items():
+                if letter is not None and letter not in excluded:
+                    stack.append((child, prefix + letter))
 
-        elif kind == 'wrong':
-            print(BROWN + 'Wrong Guesses: ' + ' '.join(items) + RESET + '\n')
+    return matches
 
-    def guessed_word(self, word, guessed_letters):
-        '''Returns True if the player has guessed all letters of the word.'''
-        return all(letter in guessed_letters for letter in word)
 
-    def hangman_stage(self, attempt):
-        '''Print the ASCII-art hangman stage depending on the number of
-           attempts.'''
-        stage = [
-            '''
+# Word list as a trie, built by the first call to matching_words
+_word_trie = None
+
+
+# ASCII-art hangman stages, indexed by the number of wrong attempts
+_HANGMAN_STAGES = (
+    '''
                -----
                |   |
                    |
@@ -129,7 +123,7 @@ class Game:
                    |
             =========
             ''',
-            '''
+    '''
                -----
                |   |
                O   |
@@ -138,7 +132,7 @@ class Game:
                    |
             =========
             ''',
-            '''
+    '''
                -----
                |   |
                O   |
@@ -147,7 +141,7 @@ class Game:
                    |
             =========
             ''',
-            '''
+    '''
                -----
                |   |
                O   |
@@ -156,7 +150,7 @@ class Game:
                    |
             =========
             ''',
-            '''
+    '''
                -----
                |   |
                O   |
@@ -165,7 +159,7 @@ class Game:
                    |
             =========
             ''',
-            '''
+    '''
                -----
                |   |
                O   |
@@ -174,7 +168,7 @@ class Game:
                    |
             =========
             ''',
-            '''
+    '''
                -----
                |   |
                O   |
@@ -183,64 +177,334 @@ class Game:
                    |
             =========
             '''
-        ]
-        print(stage[attempt])
+)
+
+
+def _encode_record(name, stats):
+    '''Encode one player record as a UTF-8 JSON line.'''
+    record = {'name': name, **stats}
+    if orjson is not None:
+        return orjson.dumps(record) + b'\n'
+    return json.dumps(record, separators=(',', ':'),
+                      ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+def _writer_loop():
+    '''
+    Perform queued writes to FILENAME in order, until the `None` job asks
+    the thread to stop.
+    Each job is a (rewrite, data) pair: `rewrite` replaces the whole file
+    with `data`, otherwise `data` is appended. Jobs that pile up are merged
+    into a single write. Failed writes are reported and the loop goes on.
+    '''
+
+    while True:
+        jobs = [_WRITE_Q.get()]
+        while True:
+            try:
+                jobs.append(_WRITE_Q.get_nowait())
+            except queue.Empty:
+                break
+
+        stop = None in jobs
+        jobs = [job for job in jobs if job is not None]
+
+        try:
+            if jobs:
+                # A full rewrite makes every job before it obsolete
+                start = 0
+                for i, (rewrite, _) in enumerate(jobs):
+                    if rewrite:
+                        start = i
+                data = b''.join(data for _, data in jobs[start:])
+
+                if jobs[start][0]:
+                    with open(FILENAME + '.tmp', 'wb') as f:
+                        f.write(data)
+                    os.replace(FILENAME + '.tmp', FILENAME)
+                else:
+                    with open(FILENAME, 'ab') as f:
+                        f.write(data)
+        except Exception as e:
+            print(BROWN + f'\nCould not save player data: {e}\n' + RESET,
+                  file=sys.stderr)
+
+        if stop:
+            return
+
+
+def _queue_write(rewrite, data):
+    '''Hand a write job to the background writer, starting it on first
+       use.'''
+    global _writer
+    if _writer is None:
+        _writer = threading.Thread(target=_writer_loop, daemon=True)
+        _writer.start()
+        atexit.register(_stop_writer)
+    _WRITE_Q.put((rewrite, data))
+
+
+def _stop_writer():
+    '''Let the background writer finish outstanding writes, waiting at
+       most a few seconds.'''
+    _WRITE_Q.put(None)
+    _writer.join(timeout=5)
+    if _writer.is_alive():
+        print(BROWN + '\nPlayer data could not be saved in time, recent '
+              'changes may be lost!\n' + RESET, file=sys.stderr)
+
+
+# Pending file writes, handled by a background thread so the game never
+# waits on the disk. The thread is started with the first write.
+_WRITE_Q = queue.Queue()
+_writer = None
+
+
+@dataclass(slots=True)
+class Player:
+    '''
+    Represents a player with name, score, and number of rounds played.
+    Player data is saved persistently in a JSON Lines file: every change
+    appends one record, and the latest record for a name wins.
+    '''
+
+    player_name: str = ''
+    score: int = 0
+    rounds: int = 0
+
+    # Parsed contents of FILENAME, loaded once and kept in sync on writes
+    _cache = None
+    # Players sorted by score, rebuilt only after the data has changed
+    _sorted_cache = None
+    # Number of records currently stored in FILENAME
+    _lines = 0
+
+    @classmethod
+    def load_players(cls):
+        '''Load all players from the JSON Lines file, if it exists.
+           The parsed data is cached, so the file is only read once.
+           Records that cannot be decoded or have no name (e.g. a line
+           cut off by a crash during an append) are skipped, and the file is rewritten
+           without them.
+           If only the old JSON file exists, its players are imported.'''
+        if cls._cache is None:
+            cls._cache = {}
+            cls._lines = 0
+            # Set when the file needs to be written out again
+            rewrite = False
+            if os.path.exists(FILENAME):
+                # Read bytes, so a cut off UTF-8 character only affects
+                # its own line
+                with open(FILENAME, 'rb') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            record = None
+                        if not isinstance(record, dict) or 'name' not in record:
+                            rewrite = True
+                            continue
+                        cls._cache[record.pop('name')] = record
+                        cls._lines += 1
+            elif os.path.exists(LEGACY_FILENAME):
+                with open(LEGACY_FILENAME, encoding='utf-8') as f:
+                    cls._cache = json.load(f)
+                rewrite = True
+            if rewrite:
+                cls.save_players(cls._cache)
+        return cls._cache
+
+    @classmethod
+    def load_highscores(cls):
+        '''Return a list of (name, stats) pairs sorted by score, highest
+           first.'''
+        if cls._sorted_cache is None:
+            cls._sorted_cache = sorted(cls.load_players().items(),
+                                       key=lambda kv: -kv[1]['Score'])
+        return cls._sorted_cache
+
+    @classmethod
+    def save_players(cls, players):
+        '''Rewrite the JSON Lines file with one record per player.
+           Data goes to a temporary file first, which then replaces the
+           original, so an interrupted write never leaves a broken file.
+           The write itself happens in the background.'''
+        data = b''.join(_encode_record(name, stats)
+                        for name, stats in players.items())
+
+        cls._sorted_cache = None
+        cls._lines = len(players)
+        _queue_write(True, data)
+
+    @classmethod
+    def append_player(cls, name, stats):
+        '''Append a single player record to the JSON Lines file.
+           The write itself happens in the background.'''
+        cls._sorted_cache = None
+        cls._lines += 1
+        _queue_write(False, _encode_record(name, stats))
+
+    @classmethod
+    def compact(cls):
+        '''Drop outdated records once the file holds more than twice as
+           many records as there are players.'''
+        players = cls.load_players()
+        if cls._lines > 2 * len(players):
+            cls.save_players(players)
+
+    @classmethod
+    def create_player(cls, name, players=None):
+        '''Create a new player entry and save it to the JSON Lines file.
+           `players` can be passed if the data has already been loaded.'''
+        p = cls(name)
+        if players is None:
+            players = cls.load_players()
+        players[name] = {'Score': p.score, 'Rounds': p.rounds}
+        cls.append_player(name, players[name])
+        return p
+
+    @classmethod
+    def player_exists(cls, name):
+        '''Check whether a player name already exists in the database.'''
+        players = cls.load_players()
+        return name in players
+
+    @classmethod
+    def clear_player(cls):
+        '''Erase all player data (used when clearing the highscore list).'''
+        cls._cache = {}
+        cls.save_players(cls._cache)
+
+    def update_player(self):
+        '''Update this player's score and round count in the JSON Lines
+           file.'''
+        players = Player.load_players()
+        players[self.player_name] = {
+            'Score': self.score,
+            'Rounds': self.rounds
+        }
+        Player.append_player(self.player_name, players[self.player_name])
+
+
+class Game:
+    '''
+    Core Hangman game logic.
+    Stores a reference to the Player object so score and rounds can be updated.
+    A `seed` can be given to make the word selection reproducible.
+    '''
 
-    def play_game(self):
+    def __init__(self, player, seed=None):
+        self.player = player
+        self._rng = _RNG if seed is None else random.Random(seed)
+
+    def get_random_word(self):
+        '''Return a random word from the predefined word list.'''
+        return self._rng.choice(_WORDS)
+
+    def display_items(self, items, kind='correct'):
+        '''
+        Return either correct or wrong guessed items as colored text, ready
+        to be written to the terminal.
+        `kind` can be 'correct' or 'wrong'. Wrong guesses are shown sorted.
+        '''
+
+        if kind == 'correct':
+            return _CORRECT_PREFIX + ' '.join(items) + _SUFFIX
+
+        elif kind == 'wrong':
+            return _WRONG_PREFIX + ' '.join(sorted(items)) + _SUFFIX
+
+    def hangman_stage(self, attempt):
+        '''Return the ASCII-art hangman stage depending on the number of
+           attempts.'''
+        return _HANGMAN_STAGES[attempt]
+
+    def play_game(self, guess_source=None):
         '''
         Main game loop.
         Handles guessing, scoring, stages, and ending conditions.
+        Guesses are read from the terminal, or taken from the iterable
+        `guess_source` if one is given (e.g. for scripted play). Raises
+        ValueError if `guess_source` runs out before the game is over.
         Returns (True, None) when won, and (False, word) when lost.
         '''
 
+        if guess_source is not None:
+            guess_source = iter(guess_source)
+
         word = self.get_random_word()
-        guessed_letters = ['_'] * len(word)
-        wrong_letters = []
+        # Positions of each letter in the word
+        positions = {}
+        for i, l in enumerate(word):
+            positions.setdefault(l, []).append(i)
+
+        guessed_letters = bytearray(b'_' * len(word))
+        wrong_letters = set()
         attempt = 0
+        # Distinct letters of the word, and those guessed so far
+        needed = frozenset(word)
+        guessed = set()
+        # Output of the current turn, one entry per line as print() would
+        # write it, sent to the terminal at once
+        out = []
 
         while True:
 
+            if out:
+                sys.stdout.write('\n'.join(out) + '\n')
+                out.clear()
+
             # Player successfully guessed all letters
-            if self.guessed_word(word, guessed_letters):
+            if len(guessed) == len(needed):
                 self.player.rounds += 1
                 self.player.update_player()
                 return True, None
 
             # Player lost after full hangman is drawn
             if attempt == 7:
-                self.hangman_stage(attempt-1)
+                print(self.hangman_stage(attempt-1))
                 self.player.update_player()
                 return False, word
 
-            guess = input('Enter a letter to guess: ').strip()
+            if guess_source is None:
+                guess = input('Enter a letter to guess: ').strip().lower()
+            else:
+                guess = next(guess_source, None)
+                if guess is None:
+                    raise ValueError('guess_source ran out of guesses '
+                                     'before the game ended')
+                guess = guess.strip().lower()
 
             # Duplicate wrong letter
             if guess in wrong_letters:
-                print(BROWN + '\nYou have already guessed that letter!\n' + RESET)
+                out.append(BROWN + '\nYou have already guessed that letter!\n' + RESET)
                 continue
 
             # Input validation: must be a single alphabetic character
-            if len(guess) != 1 or not guess.isalpha():
-                print(BROWN + '\nPlease enter exactly one alphabetic character!\n' + RESET)
+            if guess not in _VALID_LETTERS:
+                out.append(BROWN + '\nPlease enter exactly one alphabetic character!\n' + RESET)
                 continue
 
             # Correct guess
-            if guess in word:
-                for i, l in enumerate(word):
-                    if l == guess:
-                        guessed_letters[i] = guess
+            if guess in positions:
+                guessed.add(guess)
+                code = ord(guess)
+                for i in positions[guess]:
+                    guessed_letters[i] = code
 
                 self.player.score += 10
-                self.display_items(wrong_letters, 'wrong')
-                self.display_items(guessed_letters, 'correct')
+                out.append(self.display_items(wrong_letters, 'wrong'))
+                out.append(self.display_items(guessed_letters.decode(), 'correct'))
 
             # Wrong guess
             else:
-                wrong_letters.append(guess)
-                self.hangman_stage(attempt)
+                wrong_letters.add(guess)
+                out.append(self.hangman_stage(attempt))
                 attempt += 1
-                self.display_items(wrong_letters, 'wrong')
-                self.display_items(guessed_letters, 'correct')
+                out.append(self.display_items(wrong_letters, 'wrong'))
+                out.append(self.display_items(guessed_letters.decode(), 'correct'))
 
 
 def game_menu():
@@ -272,6 +536,8 @@ def create_player_ui():
     Ensures max length and checks if the player already exists.
     '''
 
+    players = Player.load_players()
+
     while True:
         name = input('\nEnter Your Name (Max. 15 Letters): ')
 
@@ -279,10 +545,10 @@ def create_player_ui():
             print(BROWN + '\nYour name is too long! Try again!\n' + RESET)
             continue
 
-        if Player.player_exists(name):
+        if name in players:
             print(BROWN + '\nPlayer Already Exists!\n' + RESET)
         else:
-            return Player.create_player(name)
+            return Player.create_player(name, players=players)
 
 
 def start_game_ui():
@@ -309,10 +575,11 @@ def start_game_ui():
 
 
 def show_highscores_ui():
-    '''Display all saved players with their score and number of rounds.'''
-    players = Player.load_players()
+    '''Display all saved players with their score and number of rounds,
+       highest score first.'''
+    players = Player.load_highscores()
 
-    if players == {}:
+    if not players:
         print('\n')
         print(BROWN + '========================' + RESET)
         print(BROWN + '===  No Entries Yet  ===' + RESET)
@@ -322,7 +589,7 @@ def show_highscores_ui():
         print(BROWN + f'{'Name':<15}{'Score':<10}{'Rounds':<10}' + RESET)
         print(BROWN + '-' * 35 + RESET)
 
-        for name, stats in players.items():
+        for name, stats in players:
             print(f'{name:<15}{stats['Score']:<10}{stats['Rounds']:<10}')
 
         print('\n===================================')
@@ -330,6 +597,7 @@ def show_highscores_ui():
 
 def main():
     '''Main application loop for the menu system.'''
+    Player.compact()
     while True:
         game_menu()
         option = input('\nSelect Your Option: ')